@@ -10,79 +10,214 @@
 #   mul r1 43
 #   div r4 23
 #   end
+#
+# Embedding (decode once, run many times without re-parsing):
+#   program = compile_program(lines)   # [(opcode, rd, src, is_reg), ...]
+#   run_program(CPU32(), program)
 # ------------------------------------------------------------
-from isa32_sim import CPU32
+from isa32_sim import CPU32, OP_MOV, OP_ADD, OP_SUB, OP_MUL, OP_DIV
+import re
 import sys
 
+# Fast path: one precompiled match for well-formed "op rd src [src2]" lines.
+# Register operands are restricted to r0-r7 so decoded indices are always in
+# range; anything else falls back to the token-based decoder below.
+# Operands need a real separator so 'r12' is never split into 'r1' + '2'.
+_SEP = r'(?:\s*,\s*|\s+)'
+_LINE_RE = re.compile(
+    r'^\s*(?P<op>[A-Za-z]+)\s+[rR](?P<rd>[0-7])' + _SEP +
+    r'(?:[rR](?P<rs>[0-7])|(?P<imm1>-?\d+))'
+    r'(?:' + _SEP + r'(?:[rR](?P<rs2>[0-7])|(?P<imm2>-?\d+)))?\s*$',
+    re.ASCII,
+)
+
+_OPCODES = {
+    'MOV': OP_MOV,
+    'ADD': OP_ADD,
+    'SUB': OP_SUB,
+    'MUL': OP_MUL,
+    'DIV': OP_DIV,
+}
+
+# Commas are plain operand separators; blank them once per line
+_COMMA_TO_SPACE = str.maketrans(',', ' ')
+
+def _with_case_variants(table):
+    """Also key each mnemonic as 'mov' and 'Mov' so lookups skip .upper()."""
+    return {alias: value
+            for name, value in table.items()
+            for alias in (name, name.lower(), name.capitalize())}
+
+_OPCODES = _with_case_variants(_OPCODES)
+
+# Register names as they usually appear, for a single-lookup fast path
+_REG_CACHE = {f'{r}{i}': i for r in 'rR' for i in range(8)}
+
+# Base-10 literals exactly as int() accepts them, e.g. '-5', '+7', '1_000'
+_INT_RE = re.compile(r'[-+]?\d+(?:_\d+)*')
+
 def parse_operand(token):
-    """Return (value, is_register, reg_index)"""
-    token = token.strip().lower().rstrip(',')
-    if token.startswith('r') and token[1:].isdigit():
+    """Return (value, is_register, reg_index), or None for an invalid token."""
+    idx = _REG_CACHE.get(token)
+    if idx is not None:
+        return None, True, idx
+    token = token.strip().lower()
+    if token.startswith('r') and token[1:].isdecimal():
         idx = int(token[1:])
+        if idx > 7:  # r0–r7 only
+            return None
         return None, True, idx
-    else:
-        return int(token), False, None
+    if not _INT_RE.fullmatch(token):
+        return None
+    return int(token), False, None
 
-def get_value(cpu, token):
-    val, is_reg, idx = parse_operand(token)
-    return cpu.R[idx] if is_reg else val
+def _err(parts, msg):
+    print(f"⚠️ Error executing '{' '.join(parts)}': {msg}")
 
-def execute_instruction(cpu, line):
-    parts = line.strip().split()
+def _operands(opcode, parts, src):
+    dest = parse_operand(parts[1])
+    if dest is None or not dest[1]:
+        return _err(parts, f"destination must be a register r0–r7: {parts[1]}")
+    source = parse_operand(src)
+    if source is None:
+        return _err(parts, f"invalid operand: {src}")
+    val, is_reg, idx = source
+    return (opcode, dest[2], idx if is_reg else val, is_reg)
+
+def _mov(parts):
+    if len(parts) < 3:
+        return _err(parts, "expected: MOV rd src")
+    return _operands(OP_MOV, parts, parts[2])
+
+# ADD and SUB accept 2 or 3 operands; the last one is the source
+def _add(parts):
+    if len(parts) < 3:
+        return _err(parts, "expected: ADD rd [rs] src")
+    if len(parts) > 3 and parse_operand(parts[2]) is None:
+        return _err(parts, f"invalid operand: {parts[2]}")
+    return _operands(OP_ADD, parts, parts[3] if len(parts) > 3 else parts[2])
+
+def _sub(parts):
+    if len(parts) < 3:
+        return _err(parts, "expected: SUB rd [rs] src")
+    if len(parts) > 3 and parse_operand(parts[2]) is None:
+        return _err(parts, f"invalid operand: {parts[2]}")
+    return _operands(OP_SUB, parts, parts[3] if len(parts) > 3 else parts[2])
+
+def _mul(parts):
+    if len(parts) < 3:
+        return _err(parts, "expected: MUL rd src")
+    return _operands(OP_MUL, parts, parts[2])
+
+def _div(parts):
+    if len(parts) < 3:
+        return _err(parts, "expected: DIV rd src")
+    return _operands(OP_DIV, parts, parts[2])
+
+def _exit(parts):
+    return 'EXIT'
+
+_HANDLERS = {
+    'MOV': _mov,
+    'ADD': _add,
+    'SUB': _sub,
+    'MUL': _mul,
+    'DIV': _div,
+    'END': _exit,
+    'EXIT': _exit,
+}
+_HANDLERS = _with_case_variants(_HANDLERS)
+
+def _unknown(op):
+    print(f"❌ Unknown instruction: {op}")
+
+def _decode_tokens(line):
+    """Slow path for lines the fast-path pattern does not cover."""
+    parts = line.translate(_COMMA_TO_SPACE).split()
     if not parts or parts[0].startswith(('#',';')):
-        return
-    op = parts[0].upper()
-
-    try:
-        # MOV supports register or immediate
-        if op == 'MOV':
-            rd_val, _, rd = parse_operand(parts[1])
-            src_val = get_value(cpu, parts[2])
-            cpu.MOV(rd, src_val)
-
-        # ADD and SUB accept 2 or 3 operands
-        elif op in ('ADD','SUB'):
-            _, _, rd = parse_operand(parts[1])
-            val2 = get_value(cpu, parts[2])
-            if len(parts) > 3:
-                val3 = get_value(cpu, parts[3])
-            else:
-                val3 = val2
-            if op == 'ADD':
-                cpu.ADD(rd, rd, val3)
+        return None
+    handler = _HANDLERS.get(parts[0])
+    if handler is None:
+        # Cold path: mixed-case spellings such as 'mOV'
+        op = parts[0].upper()
+        handler = _HANDLERS.get(op)
+        if handler is None:
+            return _unknown(op)
+    return handler(parts)
+
+def decode_instruction(line):
+    """Decode one source line into an (opcode, rd, src, is_reg) tuple.
+
+    Returns None for blank, comment and invalid lines and 'EXIT' for END/EXIT.
+    """
+    m = _LINE_RE.match(line)
+    if m:
+        opcode = _OPCODES.get(m['op'])
+        if opcode is not None:
+            if opcode in (OP_ADD, OP_SUB) and (m['rs2'] or m['imm2']):
+                rs, imm = m['rs2'], m['imm2']
             else:
-                cpu.SUB(rd, rd, val3)
+                rs, imm = m['rs'], m['imm1']
+            if rs:
+                return (opcode, int(m['rd']), int(rs), True)
+            return (opcode, int(m['rd']), int(imm), False)
+    return _decode_tokens(line)
 
-        # MUL and DIV now accept register or immediate
-        elif op == 'MUL':
-            _, _, rd = parse_operand(parts[1])
-            val = get_value(cpu, parts[2])
-            temp_idx = 6  # temp reg
-            cpu.MOV(temp_idx, val)
-            cpu.MUL(rd, temp_idx)
+def iter_program(lines):
+    """Lazily decode source lines up to END/EXIT into instruction tuples."""
+    for line in lines:
+        instr = decode_instruction(line)
+        if instr == 'EXIT':
+            return
+        if instr is not None:
+            yield instr
 
-        elif op == 'DIV':
-            _, _, rd = parse_operand(parts[1])
-            val = get_value(cpu, parts[2])
-            temp_idx = 6  # temp reg
-            cpu.MOV(temp_idx, val)
-            cpu.DIV(rd, temp_idx)
+def compile_program(lines):
+    """Decode source lines up to END/EXIT into a list of instruction tuples."""
+    return list(iter_program(lines))
 
-        elif op in ('END','EXIT'):
-            return 'EXIT'
+def run_program(cpu, program):
+    """Execute decoded instructions on cpu in a single dispatch loop."""
+    R = cpu.R
+    for op, rd, src, is_reg in program:
+        if is_reg:
+            src = R[src]
+        # Arms are ordered by how often each opcode shows up in typical
+        # programs (MOV and ADD dominate, DIV is rare), so most
+        # instructions are matched by the first one or two comparisons.
+        if op == OP_MOV:
+            cpu.MOV(rd, src)
+        elif op == OP_ADD:
+            cpu.ADD(rd, rd, src)
+        elif op == OP_SUB:
+            cpu.SUB(rd, rd, src)
+        elif op == OP_MUL:
+            cpu.MUL(rd, src, is_imm=True)
+        elif op == OP_DIV:
+            cpu.DIV(rd, src, is_imm=True)
 
-        else:
-            print(f"❌ Unknown instruction: {op}")
+def execute_instruction(cpu, line):
+    instr = decode_instruction(line)
+    if instr == 'EXIT':
+        return 'EXIT'
+    if instr is not None:
+        run_program(cpu, (instr,))
 
-    except Exception as e:
-        print(f"⚠️ Error executing '{line.strip()}': {e}")
+def _read_lines():
+    """Yield input lines, prompting only when stdin is a terminal."""
+    if not sys.stdin.isatty():
+        # Scripted input: iterate the buffered stream, skip input()/readline
+        yield from sys.stdin
+        return
+    while True:
+        yield input(">> ")
 
 def run_interactive():
     print("🧠 32-bit ISA Simulator (Interactive Mode)")
     print("Type 'END' or 'EXIT' to stop.\n")
     cpu = CPU32()
-    while True:
-        line = input(">> ").strip()
+    for line in _read_lines():
+        line = line.strip()
         if not line:
             continue
         if line.upper() in ('EXIT','END'):
@@ -95,9 +230,8 @@ def run_file(filename):
     print(f"📘 Running from file: {filename}")
     cpu = CPU32()
     with open(filename, 'r', encoding='utf-8') as f:
-        for line in f:
-            if execute_instruction(cpu, line) == 'EXIT':
-                break
+        # Stream: decode and execute one line at a time
+        run_program(cpu, iter_program(f))
     cpu.dump_registers()
     cpu.report()
 
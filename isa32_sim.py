@@ -14,6 +14,18 @@
 
 MASK32 = 0xFFFFFFFF
 
+# Opcode IDs used by the decoded program representation
+OP_MOV, OP_ADD, OP_SUB, OP_MUL, OP_DIV = range(5)
+
+# CPI (Clock Cycles Per Instruction)
+_CYCLES_MOV = 1
+_CYCLES_ADD = 1
+_CYCLES_SUB = 1
+_CYCLES_MUL = 3
+_CYCLES_DIV = 4
+
+_REG_FMT = "r{0}: {1:>12} / {2:>12} / 0x{2:08X}"
+
 
 def to_signed32(x):
     """Convert unsigned 32-bit to signed 32-bit integer."""
@@ -29,6 +41,8 @@ def wrap32(x):
 class CPU32:
     """Simulates a minimal 32-bit CPU with 8 registers and basic arithmetic ISA."""
 
+    __slots__ = ('R', 'cycles', 'instruction_count')
+
     def __init__(self):
         # 8 general purpose 32-bit registers (r0–r7)
         self.R = [0] * 8
@@ -36,68 +50,73 @@ class CPU32:
         self.cycles = 0
         self.instruction_count = 0
 
-        # CPI (Clock Cycles Per Instruction)
-        self.CPI = {
-            "MOV": 1,
-            "ADD": 1,
-            "SUB": 1,
-            "MUL": 3,
-            "DIV": 4,
-        }
-
     # -------------------- Core Instructions --------------------
 
     def MOV(self, rd, imm):
         """Move immediate or register value to rd."""
-        self.R[rd] = wrap32(imm)
-        self._count("MOV")
+        self.R[rd] = imm & MASK32
+        self.instruction_count += 1
+        self.cycles += _CYCLES_MOV
 
     def ADD(self, rd, rs, imm):
         """Add signed 32-bit values."""
-        result = to_signed32(self.R[rs]) + to_signed32(imm)
-        self.R[rd] = wrap32(result)
-        self._count("ADD")
+        # Two's complement: the low 32 bits do not depend on the signs
+        self.R[rd] = (self.R[rs] + imm) & MASK32
+        self.instruction_count += 1
+        self.cycles += _CYCLES_ADD
 
     def SUB(self, rd, rs, imm):
         """Subtract signed 32-bit values."""
-        result = to_signed32(self.R[rs]) - to_signed32(imm)
-        self.R[rd] = wrap32(result)
-        self._count("SUB")
-
-    def MUL(self, rd, rs):
-        """Multiply 32-bit signed integers (store HI in r7)."""
-        a = to_signed32(self.R[rd])
-        b = to_signed32(self.R[rs])
+        self.R[rd] = (self.R[rs] - imm) & MASK32
+        self.instruction_count += 1
+        self.cycles += _CYCLES_SUB
+
+    def MUL(self, rd, rs_or_imm, is_imm=False):
+        """Multiply 32-bit signed integers (store HI in r7).
+
+        The second operand is register rs_or_imm, or the immediate itself
+        when is_imm is set.
+        """
+        a = self.R[rd]
+        b = rs_or_imm & MASK32 if is_imm else self.R[rs_or_imm]
+        a = a - 0x100000000 if a & 0x80000000 else a
+        b = b - 0x100000000 if b & 0x80000000 else b
         product = a * b
-        self.R[rd] = wrap32(product)
-        self.R[7] = wrap32(product >> 32)
-        self._count("MUL")
-
-    def DIV(self, rd, rs):
-        """Divide 32-bit signed integers (store remainder in r7)."""
-        dividend = to_signed32(self.R[rd])
-        divisor = to_signed32(self.R[rs])
+        # Split the 64-bit product into LO (rd) and HI (r7) 32-bit words
+        self.R[rd] = product & MASK32
+        self.R[7] = (product >> 32) & MASK32
+        self.instruction_count += 1
+        self.cycles += _CYCLES_MUL
+
+    def DIV(self, rd, rs_or_imm, is_imm=False):
+        """Divide 32-bit signed integers (store remainder in r7).
+
+        The divisor is register rs_or_imm, or the immediate itself when
+        is_imm is set.
+        """
+        dividend = self.R[rd]
+        divisor = rs_or_imm & MASK32 if is_imm else self.R[rs_or_imm]
+        dividend = dividend - 0x100000000 if dividend & 0x80000000 else dividend
+        divisor = divisor - 0x100000000 if divisor & 0x80000000 else divisor
         if divisor == 0:
             print("⚠️ Division by zero ignored.")
             return
-        quotient = int(dividend / divisor)
-        remainder = dividend % divisor
-        self.R[rd] = wrap32(quotient)
-        self.R[7] = wrap32(remainder)
-        self._count("DIV")
+        # C-style truncated division in pure integer arithmetic (no float
+        # round-trip); the remainder takes the sign of the dividend
+        q = abs(dividend) // abs(divisor)
+        quotient = -q if (dividend < 0) ^ (divisor < 0) else q
+        remainder = dividend - quotient * divisor
+        self.R[rd] = quotient & MASK32
+        self.R[7] = remainder & MASK32
+        self.instruction_count += 1
+        self.cycles += _CYCLES_DIV
 
     # -------------------- Utility Methods --------------------
 
-    def _count(self, op):
-        """Increment instruction counters and cycles."""
-        self.instruction_count += 1
-        self.cycles += self.CPI.get(op, 1)
-
     def dump_registers(self):
         """Display register contents in signed, unsigned, and hex."""
-        print("\nREGISTER STATE (Signed / Unsigned / Hex):")
-        for i, val in enumerate(self.R):
-            print(f"r{i}: {to_signed32(val):>12} / {val:>12} / 0x{val:08X}")
+        lines = [_REG_FMT.format(i, to_signed32(val), val) for i, val in enumerate(self.R)]
+        print("\nREGISTER STATE (Signed / Unsigned / Hex):\n" + "\n".join(lines))
 
     def report(self):
         """Display performance summary."""